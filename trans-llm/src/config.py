@@ -1,9 +1,18 @@
 import os
-from typing import Dict, Any, Optional
+import pickle
+import re
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple, Union
 import yaml
 from loguru import logger
 from dotenv import load_dotenv
 
+# 优先使用基于 libyaml 的 C 加载器，不可用时回退到纯 Python 实现
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# 匹配形如 ${VAR} 的环境变量引用
+_ENV_VAR_RE = re.compile(r"^\$\{([^}]+)\}$")
+
 
 class Config:
     """配置管理类"""
@@ -21,7 +30,8 @@ class Config:
         self.config_path = config_path or os.path.join(
             os.path.dirname(__file__), "../../config/config.yaml"
         )
-        self.config: Dict[str, Any] = self._load_config()
+        self._env_cache: Dict[str, str] = {}
+        self.config: Dict[str, Any] = self._replace_env_vars(self._load_config())
 
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件
@@ -29,9 +39,33 @@ class Config:
         Returns:
             配置字典
         """
+        cache_path = self.config_path + ".cache.pkl"
         try:
+            stat = os.stat(self.config_path)
+            source = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+            # 缓存记录的配置文件修改时间和大小完全一致时直接读取缓存，跳过YAML解析
+            if os.path.exists(cache_path):
+                try:
+                    with open(cache_path, "rb") as f:
+                        cached = pickle.load(f)
+                    if isinstance(cached, dict) and cached.get("source") == source:
+                        return cached["config"]
+                except Exception as e:
+                    logger.warning(f"Failed to load config cache {cache_path}: {str(e)}")
+
             with open(self.config_path, "r") as f:
-                return yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
+
+            try:
+                with open(cache_path, "wb") as f:
+                    pickle.dump(
+                        {"source": source, "config": config}, f, protocol=pickle.HIGHEST_PROTOCOL
+                    )
+            except OSError as e:
+                logger.warning(f"Failed to write config cache {cache_path}: {str(e)}")
+
+            return config
         except FileNotFoundError:
             logger.warning(f"Config file not found at {self.config_path}, using default config")
             return {
@@ -43,30 +77,59 @@ class Config:
                 }
             }
 
+    def _getenv(self, name: str) -> str:
+        """读取环境变量，结果缓存在实例中
+
+        Args:
+            name: 环境变量名
+
+        Returns:
+            环境变量值，不存在时返回空字符串
+        """
+        if name not in self._env_cache:
+            self._env_cache[name] = os.getenv(name, "")
+        return self._env_cache[name]
+
     def _replace_env_vars(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """替换环境变量"""
-        if isinstance(config, dict):
-            return {k: self._replace_env_vars(v) for k, v in config.items()}
-        elif (
-            isinstance(config, str) and config.startswith("${") and config.endswith("}")
-        ):
-            env_var = config[2:-1]
-            return os.getenv(env_var, "")
-        elif isinstance(config, list):
-            return [self._replace_env_vars(item) for item in config]
-        return config
+        """替换环境变量
+
+        使用显式栈迭代遍历配置树，返回替换后的副本。
+        """
+        root: List[Any] = [config]
+        stack: deque[Tuple[Union[Dict[str, Any], List[Any]], Any]] = deque([(root, 0)])
+        while stack:
+            container, key = stack.pop()
+            value = container[key]
+            if isinstance(value, dict):
+                value = dict(value)
+                container[key] = value
+                stack.extend((value, k) for k in value)
+            elif isinstance(value, list):
+                value = list(value)
+                container[key] = value
+                stack.extend((value, i) for i in range(len(value)))
+            elif isinstance(value, str):
+                match = _ENV_VAR_RE.match(value)
+                if match:
+                    container[key] = self._getenv(match.group(1))
+        return root[0]
 
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值
 
         Args:
-            key: 配置键
+            key: 配置键，支持用"."访问嵌套配置，如"vector_db.collection_name"
             default: 默认值
 
         Returns:
             配置值
         """
-        return self.config.get(key, default)
+        value: Any = self.config
+        for part in key.split("."):
+            if not isinstance(value, dict) or part not in value:
+                return default
+            value = value[part]
+        return value
 
     def __getitem__(self, key: str) -> Any:
         """获取配置值
@@ -92,4 +155,5 @@ class Config:
 
     def reload(self):
         """重新加载配置"""
-        self.config = self._load_config()
+        self._env_cache.clear()
+        self.config = self._replace_env_vars(self._load_config())
@@ -6,6 +6,9 @@ from vector_store import VectorStore
 from crawlers.wikipedia_crawler import WikipediaCrawler
 from crawlers.psychonautwiki_crawler import PsychonautWikiCrawler
 
+# 每次写入向量存储的文档数量
+BATCH_SIZE = 500
+
 def main() -> None:
     """主函数"""
     # 解析命令行参数
@@ -24,30 +27,31 @@ def main() -> None:
         wikipedia_crawler = WikipediaCrawler(config)
         psychonautwiki_crawler = PsychonautWikiCrawler(config)
         
-        # 爬取数据
-        logger.info("开始爬取维基百科数据...")
-        wikipedia_data = wikipedia_crawler.crawl()
-        logger.info(f"爬取到{len(wikipedia_data)}条维基百科数据")
-        
-        logger.info("开始爬取PsychonautWiki数据...")
-        psychonautwiki_data = psychonautwiki_crawler.crawl()
-        logger.info(f"爬取到{len(psychonautwiki_data)}条PsychonautWiki数据")
-        
-        # 合并数据
-        all_data = wikipedia_data + psychonautwiki_data
-        
-        # 保存到向量存储
-        logger.info("开始保存数据到向量存储...")
-        for data in all_data:
-            vector_store.add_documents([{
-                "id": data["id"],
-                "text": data["content"],
-                "metadata": {
+        # 边爬取边分批保存到向量存储，不在内存中保留全部数据
+        crawlers = [
+            ("维基百科", wikipedia_crawler),
+            ("PsychonautWiki", psychonautwiki_crawler),
+        ]
+        documents: List[Dict[str, Any]] = []
+        for name, crawler in crawlers:
+            logger.info(f"开始爬取{name}数据...")
+            count = 0
+            for data in crawler.crawl():
+                documents.append({
+                    "id": data["id"],
                     "title": data["title"],
-                    "url": data["url"],
-                    "source": "wikipedia" if data in wikipedia_data else "psychonautwiki"
-                }
-            }])
+                    "content": data["content"],
+                    "source": data["source"],
+                    "source_url": data["url"]
+                })
+                count += 1
+                if len(documents) >= BATCH_SIZE:
+                    vector_store.add_documents(documents)
+                    documents = []
+            logger.info(f"爬取到{count}条{name}数据")
+
+        if documents:
+            vector_store.add_documents(documents)
         logger.info("数据保存完成")
         
     except Exception as e:
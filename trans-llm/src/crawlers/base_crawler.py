@@ -1,11 +1,129 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, Iterator, Mapping
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from urllib.parse import urlparse
+import asyncio
+import time
+import orjson
 import requests
+import zstandard as zstd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
 from config import Config
-import json
+import os
+
+# MediaWiki 每次详情查询的页面ID数量（TextExtracts 的 exlimit 上限为20）
+PAGEIDS_PER_REQUEST = 20
+
+DEFAULT_USER_AGENT = "TransColors-Crawler/0.1 (+https://github.com/AsabaSeiban/TransColors)"
+
+# 请求失败时的重试次数、指数退避系数以及需要重试的状态码
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+
+# 配置中未设置 rate_limit 时的默认请求间隔(秒)
+DEFAULT_RATE_LIMIT = 0.2
+
+# X-RateLimit-Reset 大于该值时视为Unix时间戳，否则视为剩余秒数
+_EPOCH_THRESHOLD = 1e9
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """解析 Retry-After 响应头
+
+    Args:
+        value: 秒数或HTTP日期
+
+    Returns:
+        需要等待的秒数，无法解析时返回None
+    """
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """按主机限制请求频率，同一主机相邻两次请求至少间隔 min_interval 秒"""
+
+    def __init__(self, min_interval: float) -> None:
+        """初始化限流器
+
+        Args:
+            min_interval: 同一主机的最小请求间隔(秒)
+        """
+        self.min_interval = min_interval
+        self._next: Dict[str, float] = defaultdict(float)
+        self._lock = Lock()
+
+    def reserve(self, host: str) -> float:
+        """为主机预约下一个请求时间片
+
+        Args:
+            host: 主机名
+
+        Returns:
+            距预约时间片还需等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next[host])
+            self._next[host] = slot + self.min_interval
+            return slot - now
+
+    def acquire(self, host: str) -> None:
+        """阻塞直到可以向主机发送请求
+
+        Args:
+            host: 主机名
+        """
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def async_acquire(self, host: str) -> None:
+        """异步等待直到可以向主机发送请求
+
+        Args:
+            host: 主机名
+        """
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def observe(self, host: str, headers: Mapping[str, str]) -> None:
+        """根据服务器返回的限流响应头推迟后续请求
+
+        Args:
+            host: 主机名
+            headers: 响应头
+        """
+        delay = None
+        if "Retry-After" in headers:
+            delay = parse_retry_after(headers["Retry-After"])
+        elif headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+            # X-RateLimit-Reset 可能是剩余秒数或Unix时间戳
+            try:
+                reset = float(headers["X-RateLimit-Reset"])
+                delay = reset - time.time() if reset > _EPOCH_THRESHOLD else reset
+            except ValueError:
+                pass
+        if delay and delay > 0:
+            with self._lock:
+                self._next[host] = max(self._next[host], time.monotonic() + delay)
 
 class BaseCrawler:
     """爬虫基类"""
+
+    # 配置文件 crawlers 下对应的键名
+    name = ""
     
     def __init__(self, config: Config) -> None:
         """初始化爬虫
@@ -15,6 +133,26 @@ class BaseCrawler:
         """
         self.config = config
         self.session = requests.Session()
+
+        # 连接池复用 + 失败/限流自动退避重试
+        retry = Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_FORCELIST,
+            allowed_methods=frozenset(["GET", "POST"]),
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": DEFAULT_USER_AGENT,
+            "Accept-Encoding": "gzip",
+        })
+
+        # 按主机限流，间隔取自配置 crawlers.<name>.rate_limit
+        self._rate = RateLimiter(
+            self.config.get(f"crawlers.{self.name}.rate_limit", DEFAULT_RATE_LIMIT)
+        )
         
     def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
         """发送GET请求
@@ -28,7 +166,10 @@ class BaseCrawler:
             响应数据，如果请求失败则返回None
         """
         try:
+            host = urlparse(url).netloc
+            self._rate.acquire(host)
             response = self.session.get(url, params=params, headers=headers)
+            self._rate.observe(host, response.headers)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -47,33 +188,50 @@ class BaseCrawler:
             响应数据，如果请求失败则返回None
         """
         try:
+            host = urlparse(url).netloc
+            self._rate.acquire(host)
             response = self.session.post(url, json=data, headers=headers)
+            self._rate.observe(host, response.headers)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             logger.error(f"Error making POST request to {url}: {str(e)}")
             return None
             
+    @staticmethod
+    def _compressed_path(filepath: str) -> str:
+        """获取压缩文件路径
+
+        Args:
+            filepath: 文件路径
+
+        Returns:
+            以 .zst 结尾的文件路径
+        """
+        return filepath if filepath.endswith(".zst") else filepath + ".zst"
+
     def save_data(self, data: Dict[str, Any], filepath: str) -> bool:
-        """保存数据到文件
+        """保存数据到文件，使用 orjson 序列化并以 zstd 压缩
 
         Args:
             data: 要保存的数据
-            filepath: 文件路径
+            filepath: 文件路径，实际写入 filepath + ".zst"
 
         Returns:
             是否保存成功
         """
+        filepath = self._compressed_path(filepath)
         try:
-            with open(filepath, "w") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            cctx = zstd.ZstdCompressor(level=3, threads=-1)
+            with open(filepath, "wb") as f:
+                f.write(cctx.compress(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)))
             return True
         except Exception as e:
             logger.error(f"Error saving data to {filepath}: {str(e)}")
             return False
             
     def load_data(self, filepath: str) -> Optional[Dict[str, Any]]:
-        """从文件加载数据
+        """从文件加载数据，兼容旧的未压缩JSON文件
 
         Args:
             filepath: 文件路径
@@ -81,17 +239,21 @@ class BaseCrawler:
         Returns:
             加载的数据，如果加载失败则返回None
         """
+        compressed_path = self._compressed_path(filepath)
         try:
-            with open(filepath, "r") as f:
-                return json.load(f)
+            if os.path.exists(compressed_path):
+                with open(compressed_path, "rb") as f:
+                    return orjson.loads(zstd.ZstdDecompressor().decompress(f.read()))
+            with open(filepath, "rb") as f:
+                return orjson.loads(f.read())
         except Exception as e:
             logger.error(f"Error loading data from {filepath}: {str(e)}")
             return None
             
-    def crawl(self) -> List[Dict[str, Any]]:
+    def crawl(self) -> Iterator[Dict[str, Any]]:
         """执行爬取操作
 
         Returns:
-            爬取的数据列表
+            逐条产出爬取数据的迭代器
         """
         raise NotImplementedError("Subclasses must implement crawl()") 
\ No newline at end of file
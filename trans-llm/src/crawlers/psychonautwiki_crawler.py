@@ -1,9 +1,26 @@
-from typing import Dict, Any, List
-from .base_crawler import BaseCrawler
+from typing import Dict, Any, List, Optional, Iterator, AsyncGenerator
+import asyncio
+from urllib.parse import urlparse
+import aiohttp
+from .base_crawler import (
+    BaseCrawler,
+    PAGEIDS_PER_REQUEST,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_STATUS_FORCELIST,
+    RETRY_TOTAL,
+    parse_retry_after,
+)
 from loguru import logger
 
+# 单个主机的最大并发请求数
+MAX_CONCURRENCY_PER_HOST = 8
+# 单次请求的超时时间(秒)
+REQUEST_TIMEOUT = 30
+
 class PsychonautWikiCrawler(BaseCrawler):
     """PsychonautWiki爬虫"""
+
+    name = "psychonautwiki"
     
     def __init__(self, config: Dict[str, Any]) -> None:
         """初始化PsychonautWiki爬虫
@@ -14,56 +31,153 @@ class PsychonautWikiCrawler(BaseCrawler):
         super().__init__(config)
         self.base_url = "https://psychonautwiki.org/w/api.php"
         
-    def crawl(self) -> List[Dict[str, Any]]:
+    def crawl(self) -> Iterator[Dict[str, Any]]:
         """执行爬取操作
 
         Returns:
-            爬取的数据列表
+            逐条产出爬取数据的迭代器
         """
+        loop = asyncio.new_event_loop()
+        pages = self.async_crawl()
         try:
-            # 获取药物列表
-            params = {
-                "action": "query",
-                "list": "categorymembers",
-                "cmtitle": "Category:Substances",
-                "cmlimit": 500,
-                "format": "json"
-            }
-            
-            response = self.get(self.base_url, params=params)
-            if not response:
-                return []
-                
-            # 提取药物页面ID
-            page_ids = [str(member["pageid"]) for member in response["query"]["categorymembers"]]
-            
-            # 获取药物详细信息
-            params = {
-                "action": "query",
-                "pageids": "|".join(page_ids),
-                "prop": "extracts|info",
-                "inprop": "url",
-                "exintro": True,
-                "explaintext": True,
-                "format": "json"
-            }
-            
-            response = self.get(self.base_url, params=params)
-            if not response:
-                return []
-                
-            # 格式化结果
-            results = []
-            for page_id, page in response["query"]["pages"].items():
-                results.append({
-                    "id": page_id,
-                    "title": page["title"],
-                    "url": page["fullurl"],
-                    "content": page["extract"]
-                })
-                
-            return results
+            while True:
+                try:
+                    yield loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(pages.aclose())
+            loop.close()
+
+    async def _async_get(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        params: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """发送异步GET请求
+
+        Args:
+            session: aiohttp会话
+            semaphore: 并发控制信号量
+            params: 请求参数
+
+        Returns:
+            响应数据，如果请求失败则返回None
+        """
+        host = urlparse(self.base_url).netloc
+        async with semaphore:
+            for attempt in range(RETRY_TOTAL + 1):
+                # 与同步会话的 urllib3 Retry 保持一致的退避时间
+                delay = RETRY_BACKOFF_FACTOR * (2 ** attempt)
+                try:
+                    await self._rate.async_acquire(host)
+                    async with session.get(self.base_url, params=params) as response:
+                        self._rate.observe(host, response.headers)
+                        if response.status in RETRY_STATUS_FORCELIST and attempt < RETRY_TOTAL:
+                            retry_after = parse_retry_after(response.headers.get("Retry-After", ""))
+                            if retry_after is not None:
+                                delay = retry_after
+                            logger.warning(
+                                f"GET {self.base_url} returned {response.status}, retrying in {delay:.1f}s"
+                            )
+                        else:
+                            response.raise_for_status()
+                            return await response.json()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if attempt == RETRY_TOTAL:
+                        logger.error(f"Error making GET request to {self.base_url}: {str(e)}")
+                        return None
+                    logger.warning(
+                        f"Error making GET request to {self.base_url}: {str(e)}, retrying in {delay:.1f}s"
+                    )
+                except Exception as e:
+                    logger.error(f"Error making GET request to {self.base_url}: {str(e)}")
+                    return None
+                await asyncio.sleep(delay)
+        return None
+
+    async def async_crawl(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """异步执行爬取操作
+
+        Returns:
+            按详情请求完成顺序逐条产出爬取数据的异步生成器
+        """
+        try:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENCY_PER_HOST)
+            connector = aiohttp.TCPConnector(
+                limit_per_host=MAX_CONCURRENCY_PER_HOST, keepalive_timeout=30
+            )
+            async with aiohttp.ClientSession(
+                connector=connector,
+                headers=dict(self.session.headers),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as session:
+                # 获取药物列表
+                params = {
+                    "action": "query",
+                    "list": "categorymembers",
+                    "cmtitle": "Category:Substances",
+                    "cmlimit": 500,
+                    "format": "json"
+                }
+
+                # 按 continue 令牌翻页，直到列表取完
+                page_ids: List[str] = []
+                while True:
+                    response = await self._async_get(session, semaphore, params)
+                    if not response:
+                        break
+
+                    # 提取药物页面ID
+                    page_ids.extend(str(member["pageid"]) for member in response["query"]["categorymembers"])
+
+                    if "continue" not in response:
+                        break
+                    params = {**params, **response["continue"]}
+
+                if not page_ids:
+                    return
+
+                # 分批并发获取药物详细信息
+                tasks = [
+                    asyncio.ensure_future(self._async_get(session, semaphore, {
+                        "action": "query",
+                        "pageids": "|".join(page_ids[i:i + PAGEIDS_PER_REQUEST]),
+                        "prop": "extracts|info",
+                        "inprop": "url",
+                        "exintro": 1,
+                        "explaintext": 1,
+                        "exlimit": PAGEIDS_PER_REQUEST,
+                        "format": "json"
+                    }))
+                    for i in range(0, len(page_ids), PAGEIDS_PER_REQUEST)
+                ]
+                try:
+                    for future in asyncio.as_completed(tasks):
+                        response = await future
+                        if not response:
+                            continue
+
+                        # 格式化结果
+                        for page_id, page in response["query"]["pages"].items():
+                            # 跳过没有简介内容的页面
+                            content = page.get("extract", "")
+                            if not content.strip():
+                                logger.warning(f"Empty extract in page: {page.get('title', page_id)}")
+                                continue
+
+                            yield {
+                                "id": page_id,
+                                "title": page["title"],
+                                "url": page["fullurl"],
+                                "content": content,
+                                "source": "psychonautwiki"
+                            }
+                finally:
+                    # 提前结束迭代时取消尚未完成的请求
+                    for task in tasks:
+                        task.cancel()
             
         except Exception as e:
             logger.error(f"Error crawling PsychonautWiki: {str(e)}")
-            return [] 
\ No newline at end of file
@@ -1,9 +1,11 @@
-from typing import Dict, Any, List
-from .base_crawler import BaseCrawler
+from typing import Dict, Any, List, Iterator
+from .base_crawler import BaseCrawler, PAGEIDS_PER_REQUEST
 from loguru import logger
 
 class WikipediaCrawler(BaseCrawler):
     """维基百科爬虫"""
+
+    name = "wikipedia"
     
     def __init__(self, config: Dict[str, Any]) -> None:
         """初始化维基百科爬虫
@@ -14,11 +16,11 @@ class WikipediaCrawler(BaseCrawler):
         super().__init__(config)
         self.base_url = "https://en.wikipedia.org/w/api.php"
         
-    def crawl(self) -> List[Dict[str, Any]]:
+    def crawl(self) -> Iterator[Dict[str, Any]]:
         """执行爬取操作
 
         Returns:
-            爬取的数据列表
+            逐条产出爬取数据的迭代器
         """
         try:
             # 获取药物列表
@@ -30,40 +32,52 @@ class WikipediaCrawler(BaseCrawler):
                 "format": "json"
             }
             
-            response = self.get(self.base_url, params=params)
-            if not response:
-                return []
-                
-            # 提取药物页面ID
-            page_ids = [str(member["pageid"]) for member in response["query"]["categorymembers"]]
-            
-            # 获取药物详细信息
-            params = {
-                "action": "query",
-                "pageids": "|".join(page_ids),
-                "prop": "extracts|info",
-                "inprop": "url",
-                "exintro": True,
-                "explaintext": True,
-                "format": "json"
-            }
-            
-            response = self.get(self.base_url, params=params)
-            if not response:
-                return []
-                
-            # 格式化结果
-            results = []
-            for page_id, page in response["query"]["pages"].items():
-                results.append({
-                    "id": page_id,
-                    "title": page["title"],
-                    "url": page["fullurl"],
-                    "content": page["extract"]
-                })
-                
-            return results
+            # 按 continue 令牌翻页，直到列表取完
+            page_ids: List[str] = []
+            while True:
+                response = self.get(self.base_url, params=params)
+                if not response:
+                    break
+
+                # 提取药物页面ID
+                page_ids.extend(str(member["pageid"]) for member in response["query"]["categorymembers"])
+
+                if "continue" not in response:
+                    break
+                params = {**params, **response["continue"]}
+
+            # 分批获取药物详细信息
+            for i in range(0, len(page_ids), PAGEIDS_PER_REQUEST):
+                params = {
+                    "action": "query",
+                    "pageids": "|".join(page_ids[i:i + PAGEIDS_PER_REQUEST]),
+                    "prop": "extracts|info",
+                    "inprop": "url",
+                    "exintro": True,
+                    "explaintext": True,
+                    "exlimit": PAGEIDS_PER_REQUEST,
+                    "format": "json"
+                }
+
+                response = self.get(self.base_url, params=params)
+                if not response:
+                    continue
+
+                # 格式化结果
+                for page_id, page in response["query"]["pages"].items():
+                    # 跳过没有简介内容的页面
+                    content = page.get("extract", "")
+                    if not content.strip():
+                        logger.warning(f"Empty extract in page: {page.get('title', page_id)}")
+                        continue
+
+                    yield {
+                        "id": page_id,
+                        "title": page["title"],
+                        "url": page["fullurl"],
+                        "content": content,
+                        "source": "wikipedia"
+                    }
             
         except Exception as e:
-            logger.error(f"Error crawling Wikipedia: {str(e)}")
-            return [] 
\ No newline at end of file
+            logger.error(f"Error crawling Wikipedia: {str(e)}")
\ No newline at end of file
@@ -1,7 +1,13 @@
 import re
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
+# 预编译的正则表达式
+_WHITESPACE_RE = re.compile(r"\s+")
+_SPECIAL_CHARS_RE = re.compile(r"[^\w\s.,;:!?()-]")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 class TextProcessor:
     """文本处理器"""
@@ -21,13 +27,8 @@ class TextProcessor:
         if not text:
             return ""
 
-        # 移除多余空白
-        text = re.sub(r"\s+", " ", text)
-
-        # 移除特殊字符
-        text = re.sub(r"[^\w\s.,;:!?()-]", "", text)
-
-        return text.strip()
+        # 先移除特殊字符缩短文本，再合并多余空白
+        return _WHITESPACE_RE.sub(" ", _SPECIAL_CHARS_RE.sub("", text)).strip()
 
     def split_text(
         self, text: str, chunk_size: int = 1000, overlap: int = 200
@@ -48,32 +49,34 @@ class TextProcessor:
         # 清理文本
         text = self.clean_text(text)
 
-        # 按句子分割
-        sentences = re.split(r"(?<=[.!?])\s+", text)
-        current_chunk: List[str] = []
-        chunks = []
-        current_length = 0
-
-        for sentence in sentences:
-            sentence_length = len(sentence)
+        if not text:
+            return []
 
-            if current_length + sentence_length > chunk_size and current_chunk:
-                # 当前块已满，保存并创建新块
-                chunk_text = " ".join(current_chunk)
-                if len(chunk_text) >= self.min_length:
-                    chunks.append(chunk_text)
-                current_chunk = []
-                current_length = 0
+        # 记录每个句子的起止偏移
+        boundaries = list(_SENTENCE_END_RE.finditer(text))
+        starts = [0] + [m.end() for m in boundaries]
+        ends = [m.start() for m in boundaries] + [len(text)]
 
-            current_chunk.append(sentence)
-            current_length += sentence_length
+        chunks = []
+        first = 0
+        while first < len(starts):
+            chunk_start = starts[first]
 
-        # 处理最后一块
-        if current_chunk:
-            chunk_text = " ".join(current_chunk)
+            # 在不超过chunk_size的前提下尽量多放句子，至少放一句
+            last = max(bisect_right(ends, chunk_start + chunk_size) - 1, first)
+            chunk_text = text[chunk_start:ends[last]]
             if len(chunk_text) >= self.min_length:
                 chunks.append(chunk_text)
 
+            if last == len(starts) - 1:
+                break
+
+            # 下一块从距当前块末尾overlap以内的第一个句子开始；
+            # 若这样放不下下一个新句子，新块只会是当前块的子串，此时不保留重叠
+            first = max(bisect_left(starts, ends[last] - overlap), first + 1)
+            if ends[last + 1] - starts[first] > chunk_size:
+                first = last + 1
+
         return chunks
 
     def process_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
@@ -3,10 +3,15 @@ from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any, Optional, Union
 import yaml
+import hashlib
 from loguru import logger
 import os
 from config import Config
 import numpy as np
+import torch
+
+# 内存向量矩阵的初始行容量
+INITIAL_CAPACITY = 1024
 
 
 class VectorStore:
@@ -19,8 +24,15 @@ class VectorStore:
             config: 配置对象
         """
         self.config = config
-        self.vectors: Dict[str, np.ndarray] = {}
-        self.metadata: Dict[str, Dict[str, Any]] = {}
+
+        # 内存向量按行连续存放在 (容量, D) float32 矩阵中，前len(self._ids)行有效；
+        # 首次add前为 (0, 0) 占位，按向量维度分配
+        self._matrix: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        self._ids: List[str] = []
+        self._meta: List[Dict[str, Any]] = []
+        self._pos: Dict[str, int] = {}
+        # 与矩阵各行对应的范数倒数，插入时计算，零向量记为0
+        self._inv_norms: np.ndarray = np.empty(0, dtype=np.float32)
         
         # 初始化向量数据库
         self.client = chromadb.PersistentClient(
@@ -28,15 +40,26 @@ class VectorStore:
             settings=Settings(anonymized_telemetry=False),
         )
 
-        # 获取或创建集合
+        # 获取或创建集合，嵌入已归一化，默认使用内积代替余弦距离
+        hnsw = self.config.get("vector_db.hnsw") or {}
         self.collection = self.client.get_or_create_collection(
-            name=self.config.get("vector_db.collection_name")
+            name=self.config.get("vector_db.collection_name"),
+            metadata={
+                "hnsw:space": hnsw.get("space", "ip"),
+                "hnsw:M": hnsw.get("M", 32),
+                "hnsw:construction_ef": hnsw.get("construction_ef", 200),
+                "hnsw:search_ef": hnsw.get("search_ef", 64),
+                "hnsw:num_threads": hnsw.get("num_threads") or os.cpu_count(),
+            },
         )
 
-        # 初始化嵌入模型
+        # 初始化嵌入模型，有GPU时使用FP16推理
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.embedding_model = SentenceTransformer(
-            self.config.get("vector_db.embedding_model")
+            self.config.get("vector_db.embedding_model"), device=self.device
         )
+        if self.device == "cuda":
+            self.embedding_model.half()
 
     def add(self, id: str, vector: np.ndarray, metadata: Optional[Dict[str, Any]] = None) -> None:
         """添加向量
@@ -46,8 +69,34 @@ class VectorStore:
             vector: 向量数据
             metadata: 元数据
         """
-        self.vectors[id] = vector
-        self.metadata[id] = metadata or {}
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        if len(self._matrix) == 0:
+            self._matrix = np.empty((INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32)
+            self._inv_norms = np.empty(INITIAL_CAPACITY, dtype=np.float32)
+        elif vector.shape[0] != self._matrix.shape[1]:
+            raise ValueError(
+                f"Vector dimension {vector.shape[0]} does not match store dimension {self._matrix.shape[1]}"
+            )
+
+        pos = self._pos.get(id)
+        if pos is None:
+            pos = len(self._ids)
+            if pos == len(self._matrix):
+                # 容量不足时按倍数扩容
+                grown = np.empty((2 * len(self._matrix), self._matrix.shape[1]), dtype=np.float32)
+                grown[:pos] = self._matrix
+                self._matrix = grown
+                grown_norms = np.empty(len(grown), dtype=np.float32)
+                grown_norms[:pos] = self._inv_norms
+                self._inv_norms = grown_norms
+            self._ids.append(id)
+            self._meta.append({})
+            self._pos[id] = pos
+
+        norm = np.linalg.norm(vector)
+        self._matrix[pos] = vector
+        self._inv_norms[pos] = 1.0 / norm if norm > 0 else 0.0
+        self._meta[pos] = metadata or {}
         
     def get(self, id: str) -> Optional[Dict[str, Any]]:
         """获取向量
@@ -58,11 +107,12 @@ class VectorStore:
         Returns:
             向量数据，如果不存在则返回None
         """
-        if id not in self.vectors:
+        pos = self._pos.get(id)
+        if pos is None:
             return None
         return {
-            "vector": self.vectors[id],
-            "metadata": self.metadata[id]
+            "vector": self._matrix[pos].copy(),
+            "metadata": self._meta[pos]
         }
         
     def search(self, query_vector: np.ndarray, top_k: int = 5) -> List[Dict[str, Any]]:
@@ -75,24 +125,32 @@ class VectorStore:
         Returns:
             相似向量列表
         """
-        if not self.vectors:
+        if not self._ids:
             return []
             
-        # 计算余弦相似度
-        similarities = {}
-        for id, vector in self.vectors.items():
-            similarity = np.dot(query_vector, vector) / (np.linalg.norm(query_vector) * np.linalg.norm(vector))
-            similarities[id] = similarity
+        # 计算余弦相似度，存储向量的范数已在插入时算好
+        query = np.asarray(query_vector, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return []
+        n = len(self._ids)
+        sims = (self._matrix[:n] @ (query / query_norm)) * self._inv_norms[:n]
             
-        # 获取top_k结果
-        top_ids = sorted(similarities.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        # 获取top_k结果：先O(N)选出前k个，再只对这k个排序
+        if top_k <= 0:
+            return []
+        if top_k < len(sims):
+            top_idx = np.argpartition(sims, -top_k)[-top_k:]
+        else:
+            top_idx = np.arange(len(sims))
+        top_idx = top_idx[np.argsort(-sims[top_idx])]
         
         return [{
-            "id": id,
-            "similarity": similarity,
-            "vector": self.vectors[id],
-            "metadata": self.metadata[id]
-        } for id, similarity in top_ids]
+            "id": self._ids[i],
+            "similarity": float(sims[i]),
+            "vector": self._matrix[i].copy(),
+            "metadata": self._meta[i]
+        } for i in top_idx]
         
     def delete(self, id: str) -> bool:
         """删除向量
@@ -103,17 +161,29 @@ class VectorStore:
         Returns:
             是否删除成功
         """
-        if id not in self.vectors:
+        pos = self._pos.pop(id, None)
+        if pos is None:
             return False
-            
-        del self.vectors[id]
-        del self.metadata[id]
+
+        # 用最后一行填补被删除的位置
+        last = len(self._ids) - 1
+        if pos != last:
+            self._matrix[pos] = self._matrix[last]
+            self._inv_norms[pos] = self._inv_norms[last]
+            self._ids[pos] = self._ids[last]
+            self._meta[pos] = self._meta[last]
+            self._pos[self._ids[pos]] = pos
+        self._ids.pop()
+        self._meta.pop()
         return True
         
     def clear(self) -> None:
         """清空所有向量"""
-        self.vectors.clear()
-        self.metadata.clear()
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._ids = []
+        self._meta = []
+        self._pos = {}
+        self._inv_norms = np.empty(0, dtype=np.float32)
 
     def add_documents(self, documents: List[Dict]):
         """添加文档到向量数据库"""
@@ -123,34 +193,88 @@ class VectorStore:
             texts = []
             metadatas = []
 
-            for i, doc in enumerate(documents):
-                # 生成唯一ID
-                doc_id = f"doc_{i}_{hash(doc.get('content', ''))}"
-                ids.append(doc_id)
+            seen_ids = set()
 
+            for doc in documents:
                 # 获取文本内容
                 text = doc.get("content", "")
+
+                # 由来源、页面ID和块序号生成稳定ID，页面内容更新后重新导入时覆盖旧版本
+                source = doc.get("source", "unknown")
+                page_id = doc.get("id", doc.get("source_url", ""))
+                chunk_index = doc.get("chunk_index", 0)
+                doc_id = hashlib.blake2b(
+                    f"{source}\n{page_id}\n{chunk_index}".encode("utf-8"), digest_size=16
+                ).hexdigest()
+                if doc_id in seen_ids:
+                    continue
+                seen_ids.add(doc_id)
+                ids.append(doc_id)
                 texts.append(text)
 
                 # 保存元数据
                 metadata = {
-                    "source": doc.get("source", "unknown"),
+                    "source": source,
                     "source_url": doc.get("source_url", ""),
                     "field": doc.get("field", "unknown"),
-                    "chunk_index": doc.get("chunk_index", 0),
+                    "chunk_index": chunk_index,
+                    "content_hash": hashlib.blake2b(
+                        text.encode("utf-8"), digest_size=16
+                    ).hexdigest(),
                 }
                 metadatas.append(metadata)
 
+            # 跳过集合中已存在且内容未变化的文档，避免重复编码
+            existing = self.collection.get(ids=ids, include=["metadatas"])
+            stored_hashes = {
+                doc_id: (metadata or {}).get("content_hash")
+                for doc_id, metadata in zip(existing["ids"], existing["metadatas"] or [])
+            }
+            changed = [
+                i for i, doc_id in enumerate(ids)
+                if stored_hashes.get(doc_id) != metadatas[i]["content_hash"]
+            ]
+            skipped = len(ids) - len(changed)
+            if skipped:
+                logger.info(f"Skipped {skipped} unchanged documents")
+            if not changed:
+                return
+            ids = [ids[i] for i in changed]
+            texts = [texts[i] for i in changed]
+            metadatas = [metadatas[i] for i in changed]
+
+            # 相同内容只编码一次，再按原顺序展开
+            unique_index: Dict[str, int] = {}
+            unique_texts: List[str] = []
+            positions = []
+            for text, metadata in zip(texts, metadatas):
+                digest = metadata["content_hash"]
+                if digest not in unique_index:
+                    unique_index[digest] = len(unique_texts)
+                    unique_texts.append(text)
+                positions.append(unique_index[digest])
+
             # 生成嵌入
-            embeddings = self.embedding_model.encode(texts).tolist()
+            unique_embeddings = self.embedding_model.encode(
+                unique_texts,
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+                device=self.device,
+            ).astype(np.float32, copy=False)
+            if len(unique_texts) == len(texts):
+                embeddings = unique_embeddings
+            else:
+                embeddings = unique_embeddings[positions]
 
             # 添加到集合
-            self.collection.add(
+            self.collection.upsert(
                 embeddings=embeddings, documents=texts, metadatas=metadatas, ids=ids
             )
 
             logger.info(
-                f"Successfully added {len(documents)} documents to vector store"
+                f"Successfully added {len(ids)} documents to vector store"
             )
 
         except Exception as e: